@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Array engine for the Day1 dial: parse a whole rotation log as bytes and
+count zeros with cumulative sums instead of a per-line Python loop.
+
+Shared by puzzle1 (lands on 0) and puzzle2 (passes over/lands on 0).
+The array engine requires NumPy; callers fall back to the plain loops when
+it is missing. The chunked process-pool engine and the streaming DialCounter are pure
+Python.
+"""
+
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+	np = None
+
+DIAL_SIZE = 100
+DIAL_START = 50
+
+# int64 holds any 18-digit distance; longer ones take the per-line path
+MAX_DIGITS = 18
+
+_NEWLINE = 10
+_CR = 13
+_SPACE_BYTES = b' \t\r\x0b\x0c\x1c\x1d\x1e\x1f'  # what str.strip() removes
+
+
+def _parse_line(raw):
+	"""(left, dist) for one line exactly as the loops read it, or None to skip."""
+	line = raw.decode('utf-8', 'replace').strip()
+	if not line:
+		return None
+	try:
+		dist = int(line[1:])
+	except Exception:
+		return None
+	return line[0].upper() == 'L', dist
+
+
+def parse_rotations(data):
+	"""Parse rotation lines from `data` (bytes) into (left, dist) arrays.
+
+	left is a bool array (True for L/l, anything else turns right), dist an
+	int64 array. Plain lines (a direction byte followed by at most
+	MAX_DIGITS digits) are decoded with array ops; anything else (blank
+	lines, whitespace, signs, underscores, ...) goes through the loops' own
+	int(line[1:]) one line at a time, so every line is accepted or skipped
+	exactly as count_zeros does. Returns None, so callers fall back to the
+	loops, when NumPy is missing, a distance does not fit in int64 or a line
+	holds a lone carriage return.
+	"""
+	if np is None:
+		return None
+	buf = np.frombuffer(data, dtype=np.uint8)
+	if buf.size == 0:
+		return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+	# line starts and (exclusive) ends from the newline positions
+	nl = np.flatnonzero(buf == _NEWLINE)
+	starts = np.concatenate(([0], nl + 1))
+	ends = np.concatenate((nl, [buf.size]))
+	if starts[-1] == buf.size:
+		starts = starts[:-1]
+		ends = ends[:-1]
+	n_lines = starts.size
+	# drop a CRLF carriage return
+	has_cr = (ends > starts) & (buf[np.maximum(ends - 1, 0)] == _CR)
+	ends = ends - has_cr
+	n_digits = ends - starts - 1
+
+	# non-digit bytes before each position, to test "rest of line is digits"
+	non_digit = np.zeros(buf.size + 1, dtype=np.int64)
+	np.cumsum((buf < 48) | (buf > 57), out=non_digit[1:])
+	first = buf[np.minimum(starts, buf.size - 1)]
+	first_space = np.zeros(n_lines, dtype=bool)
+	for ch in _SPACE_BYTES + b'\n':
+		first_space |= first == ch
+	body = np.minimum(starts + 1, ends)
+	plain = ((n_digits >= 1) & (n_digits <= MAX_DIGITS) & ~first_space
+		& (non_digit[ends] == non_digit[body]))
+
+	left = (first == ord('L')) | (first == ord('l'))
+	dist = np.zeros(n_lines, dtype=np.int64)
+	for k in range(int(n_digits[plain].max(initial=0))):
+		step = plain & (n_digits > k)
+		digit = buf[np.minimum(starts + 1 + k, buf.size - 1)].astype(np.int64) - 48
+		dist = np.where(step, dist * 10 + digit, dist)
+
+	keep = plain.copy()
+	for i in np.flatnonzero(~plain):
+		raw = data[starts[i]:ends[i]]
+		if b'\r' in raw:
+			return None  # a lone CR splits lines in text mode; leave it to the loops
+		parsed = _parse_line(raw)
+		if parsed is None:
+			continue
+		if not -(1 << 63) <= parsed[1] < (1 << 63):
+			return None
+		left[i], dist[i] = parsed
+		keep[i] = True
+	return left[keep], dist[keep]
+
+
+def positions(left, dist, size=DIAL_SIZE, start=DIAL_START):
+	"""Dial position after each rotation (cumulative sum mod size)."""
+	steps = np.where(left, -(dist % size), dist % size)
+	return (start + np.cumsum(steps)) % size
+
+
+def count_landings(left, dist, size=DIAL_SIZE, start=DIAL_START):
+	"""Number of rotations that end with the needle on 0."""
+	if dist.size == 0:
+		return 0
+	return int(np.count_nonzero(positions(left, dist, size, start) == 0))
+
+
+def count_passes(left, dist, size=DIAL_SIZE, start=DIAL_START):
+	"""Number of clicks that land on 0 during any rotation."""
+	if dist.size == 0:
+		return 0
+	pos = positions(left, dist, size, start)
+	prev = np.empty_like(pos)
+	prev[0] = start % size
+	prev[1:] = pos[:-1]
+	# clicks needed from prev to reach 0 for the first time
+	k0 = np.where(left, prev % size, (-prev) % size)
+	k_first = np.where(k0 == 0, size, k0)
+	hits = np.where(k_first <= dist, 1 + (dist - k_first) // size, 0)
+	return int(hits.sum())
+
+
+# --- chunked evaluation -------------------------------------------------
+#
+# Rotations add up mod size, so a log can be cut on line boundaries and
+# each chunk evaluated from a relative start of 0. For every real start
+# position p the chunk then contributes a fixed number of zeros and a net
+# offset, and the parent stitches chunks together with a prefix over those
+# offsets.
+
+def split_file(path, parts):
+	"""Cut `path` into at most `parts` (begin, end) byte ranges on line boundaries."""
+	total = os.path.getsize(path)
+	if total == 0:
+		return []
+	parts = max(1, min(parts, total))
+	bounds = [0]
+	with open(path, 'rb') as f:
+		for i in range(1, parts):
+			off = total * i // parts
+			if off <= bounds[-1]:
+				continue
+			f.seek(off - 1)
+			f.readline()  # finish the line that straddles off
+			off = f.tell()
+			if off >= total:
+				break
+			if off > bounds[-1]:
+				bounds.append(off)
+	bounds.append(total)
+	return list(zip(bounds, bounds[1:]))
+
+
+def chunk_table(path, begin, end, size=DIAL_SIZE):
+	"""Evaluate the lines in path[begin:end] for every start position.
+
+	Returns (landings, passes, net): landings[p] and passes[p] are the zero
+	counts of puzzle1 and puzzle2 when the chunk starts at position p, and
+	net is the chunk's offset mod size.
+	"""
+	# s is the unwrapped offset from the chunk start. For start p a move
+	# from s to s' passes floor((p+s')/size) - floor((p+s)/size) zeros
+	# (right) and floor((p+s-1)/size) - floor((p+s'-1)/size) zeros (left);
+	# floor((p+x)/size) = x//size + [p >= size - x%size], so each move adds
+	# a constant plus two step functions of p, kept in the diff array.
+	land_hist = [0] * size
+	diff = [0] * (size + 1)
+	const = 0
+	s = 0
+	with open(path, 'rb') as f:
+		f.seek(begin)
+		pos = begin
+		for raw in f:
+			if pos >= end:
+				break
+			pos += len(raw)
+			line = raw.strip()
+			if not line:
+				continue
+			try:
+				dist = int(line[1:])
+			except Exception:
+				continue
+			if line[:1].upper() == b'L':
+				nxt = s - dist
+				a, b = s - 1, nxt - 1
+			else:
+				nxt = s + dist
+				a, b = nxt, s
+			if dist > 0:
+				# zeros = floor((p+a)/size) - floor((p+b)/size); the loops
+				# count no passes for a zero or negative distance
+				const += a // size - b // size
+				diff[size - a % size] += 1
+				diff[size - b % size] -= 1
+			land_hist[nxt % size] += 1
+			s = nxt
+	landings = [land_hist[-p % size] for p in range(size)]
+	passes = []
+	run = const
+	for p in range(size):
+		run += diff[p]
+		passes.append(run)
+	return landings, passes, s % size
+
+
+def count_parallel(path, workers=None, size=DIAL_SIZE, start=DIAL_START):
+	"""Count (landings, passes) for the log at `path` with a process pool."""
+	workers = workers or os.cpu_count() or 1
+	ranges = split_file(path, workers)
+	if not ranges:
+		return 0, 0
+	with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+		tables = list(pool.map(chunk_table, [path] * len(ranges),
+			[b for b, _ in ranges], [e for _, e in ranges], [size] * len(ranges)))
+	pos = start % size
+	landings = passes = 0
+	for land, passed, net in tables:
+		landings += land[pos]
+		passes += passed[pos]
+		pos = (pos + net) % size
+	return landings, passes
+
+
+# --- streaming ----------------------------------------------------------
+
+class DialCounter:
+	"""Running dial state for logs that are still growing.
+
+	Keeps the position and both zero counts (puzzle1 landings, puzzle2
+	passes) in O(1) memory; feed_bytes() also holds the unfinished last
+	line of the previous chunk until its newline arrives.
+	"""
+
+	def __init__(self, size=DIAL_SIZE, start=DIAL_START):
+		self.size = size
+		self.pos = start % size
+		self.landings = 0
+		self.passes = 0
+		self.offset = 0  # bytes consumed through feed_bytes
+		self._partial = b''
+
+	def _step(self, raw):
+		line = raw.strip()
+		if not line:
+			return
+		try:
+			dist = int(line[1:])
+		except Exception:
+			return
+		size = self.size
+		pos = self.pos
+		if line[:1].upper() in ('L', b'L'):
+			k0 = pos % size
+			pos = (pos - dist) % size
+		else:
+			k0 = (-pos) % size
+			pos = (pos + dist) % size
+		k_first = k0 if k0 != 0 else size
+		if k_first <= dist:
+			self.passes += 1 + (dist - k_first) // size
+		if pos == 0:
+			self.landings += 1
+		self.pos = pos
+
+	def feed(self, lines):
+		"""Apply complete rotation lines (str or bytes)."""
+		for raw in lines:
+			self._step(raw)
+
+	def feed_bytes(self, chunk):
+		"""Apply a raw chunk of the log; a trailing partial line is kept."""
+		self.offset += len(chunk)
+		data = self._partial + chunk
+		lines = data.split(b'\n')
+		self._partial = lines.pop()
+		self.feed(lines)
+
+	def flush(self):
+		"""Apply the pending partial line, e.g. at the end of a finished log."""
+		line, self._partial = self._partial, b''
+		self._step(line)
+
+	def checkpoint(self):
+		"""JSON-friendly snapshot of the state; see resume()."""
+		return {
+			'size': self.size,
+			'pos': self.pos,
+			'landings': self.landings,
+			'passes': self.passes,
+			'offset': self.offset,
+			'partial': self._partial.decode('latin-1'),
+		}
+
+	@classmethod
+	def resume(cls, state):
+		counter = cls(state['size'], state['pos'])
+		counter.landings = state['landings']
+		counter.passes = state['passes']
+		counter.offset = state['offset']
+		counter._partial = state['partial'].encode('latin-1')
+		return counter
+
+
+def follow(path, counter, report, chunk_size=1 << 16, poll=1.0, checkpoint_path=None):
+	"""Tail `path` into `counter`, calling report(counter) whenever it advances.
+
+	Reads at most chunk_size bytes at a time from counter.offset, so a
+	resumed counter picks up where its checkpoint stopped. When
+	checkpoint_path is given the state is written there after every batch.
+	Runs until interrupted.
+	"""
+	with open(path, 'rb') as f:
+		f.seek(counter.offset)
+		while True:
+			chunk = f.read(chunk_size)
+			if not chunk:
+				time.sleep(poll)
+				continue
+			counter.feed_bytes(chunk)
+			if checkpoint_path:
+				save_checkpoint(counter, checkpoint_path)
+			report(counter)
+
+
+def save_checkpoint(counter, path):
+	tmp = path + '.tmp'
+	with open(tmp, 'w') as f:
+		json.dump(counter.checkpoint(), f)
+	os.replace(tmp, path)
+
+
+def load_checkpoint(path, size=DIAL_SIZE, start=DIAL_START):
+	"""Counter stored at `path`, or a fresh one if there is no checkpoint yet."""
+	try:
+		with open(path, 'r') as f:
+			return DialCounter.resume(json.load(f))
+	except FileNotFoundError:
+		return DialCounter(size, start)
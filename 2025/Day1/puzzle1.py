@@ -2,10 +2,13 @@
 """Part 2: count every time needle lands on 0."""
 
 import sys
+import argparse
 
+import dial
 
-def count_zeros(lines):
-    pos = 50
+
+def count_zeros(lines, size=dial.DIAL_SIZE, start=dial.DIAL_START):
+    pos = start % size
     zeros = 0
     for raw in lines:
         line = raw.strip()
@@ -17,23 +20,79 @@ def count_zeros(lines):
         except Exception:
             continue
         if dirc == 'L':
-            pos = (pos - dist) % 100
+            pos = (pos - dist) % size
         else:
-            pos = (pos + dist) % 100
+            pos = (pos + dist) % size
         if pos == 0:
             zeros += 1
     return zeros
 
 
+def count_zeros_array(data, size=dial.DIAL_SIZE, start=dial.DIAL_START):
+    # data: whole rotation log as bytes; same answer as count_zeros
+    parsed = dial.parse_rotations(data)
+    if parsed is None:
+        return count_zeros(data.decode().splitlines(), size, start)
+    left, dist = parsed
+    return dial.count_landings(left, dist, size, start)
+
+
 def main(argv=None):
-    argv = argv if argv is not None else sys.argv[1:]
-    if len(argv) >= 1:
-        path = argv[0]
-        with open(path, 'r') as f:
+    parser = argparse.ArgumentParser(description='Count rotations that land the dial on 0')
+    parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+    parser.add_argument('--engine', choices=('loop', 'array', 'parallel'), default='loop',
+                        help='per-line loop, NumPy array engine or process pool (default: loop)')
+    parser.add_argument('--size', type=int, default=dial.DIAL_SIZE, help='number of dial positions')
+    parser.add_argument('--start', type=int, default=dial.DIAL_START, help='starting dial position')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for --engine parallel (default: CPU count)')
+    parser.add_argument('--follow', action='store_true',
+                        help='tail the input file and print the count as it grows')
+    parser.add_argument('--chunk-size', type=int, default=1 << 16, help='bytes read per step in --follow mode')
+    parser.add_argument('--poll', type=float, default=1.0, help='seconds between checks for new data in --follow mode')
+    parser.add_argument('--checkpoint', help='state file to resume from and update in --follow mode')
+    args = parser.parse_args(argv)
+    if args.size < 1:
+        parser.error('--size must be at least 1')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+
+    if args.follow:
+        if not args.input_file:
+            parser.error('--follow needs an input file')
+        if args.checkpoint:
+            counter = dial.load_checkpoint(args.checkpoint, args.size, args.start)
+        else:
+            counter = dial.DialCounter(args.size, args.start)
+        try:
+            dial.follow(args.input_file, counter, lambda c: print(c.landings, flush=True),
+                        args.chunk_size, args.poll, args.checkpoint)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.engine == 'parallel':
+        if not args.input_file:
+            parser.error('--engine parallel needs an input file')
+        counts = dial.count_parallel(args.input_file, args.workers, args.size, args.start)
+        print(counts[0])
+        return
+
+    if args.engine == 'array':
+        if args.input_file:
+            with open(args.input_file, 'rb') as f:
+                data = f.read()
+        else:
+            data = sys.stdin.buffer.read()
+        print(count_zeros_array(data, args.size, args.start))
+        return
+
+    if args.input_file:
+        with open(args.input_file, 'r') as f:
             lines = f.readlines()
     else:
         lines = sys.stdin.readlines()
-    result = count_zeros(lines)
+    result = count_zeros(lines, args.size, args.start)
     print(result)
 
 
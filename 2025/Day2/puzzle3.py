@@ -14,6 +14,8 @@ import sys
 import re
 import argparse
 
+import repeat_index
+
 
 def iter_ranges_from_line(line):
 	parts = [p.strip() for p in line.strip().split(',') if p.strip()]
@@ -49,27 +51,22 @@ def is_double_repeat(n: int) -> bool:
 
 def sum_invalid_in_range(lo: int, hi: int) -> int:
 	total = 0
-	# Instead of scanning every number in large ranges, generate double-repeat numbers
-	# of even length and test if they fall into range.
-	# Determine min and max lengths to consider
+	# A double-repeat number of length 2*half is X * (10**half + 1) for a block X
+	# of exactly half digits, so per length the invalid IDs in [lo, hi] are an
+	# arithmetic series over a clamped interval of X. O(digits) for any bounds.
 	min_len = len(str(lo))
 	max_len = len(str(hi))
-	# ensure even lengths only
 	for L in range(min_len, max_len + 1):
 		if L % 2 != 0:
 			continue
 		half = L // 2
+		mult = 10 ** half + 1
 		# first half cannot have leading zero; so first digit 1-9
-		start = 10 ** (half - 1)
-		end = 10 ** half - 1
-		for first in range(start, end + 1):
-			s = str(first) + str(first)
-			val = int(s)
-			if val < lo:
-				continue
-			if val > hi:
-				break
-			total += val
+		first = max(10 ** (half - 1), -(-lo // mult))
+		last = min(10 ** half - 1, hi // mult)
+		if first > last:
+			continue
+		total += mult * (first + last) * (last - first + 1) // 2
 	return total
 
 
@@ -83,6 +80,9 @@ def solve_ranges_line(line: str) -> int:
 def main(argv=None):
 	parser = argparse.ArgumentParser(description='Sum invalid double-repeat IDs from ranges')
 	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--index', help='repeated-ID index file to query (built on first use)')
+	parser.add_argument('--index-digits', type=int, default=12,
+		help='largest ID length covered when building the index (default: 12)')
 	args = parser.parse_args(argv)
 
 	if args.input_file:
@@ -97,6 +97,14 @@ def main(argv=None):
 	if not content:
 		print(0)
 		return
+	if args.index:
+		try:
+			index = repeat_index.load_or_build(args.index, args.index_digits, 'double')
+			# overlapping ranges are merged first, so shared IDs count once
+			print(index.sum_ranges(iter_ranges_from_line(content)))
+		except ValueError as e:
+			parser.error(str(e))
+		return
 	result = solve_ranges_line(content)
 	print(result)
 
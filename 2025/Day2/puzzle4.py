@@ -7,7 +7,8 @@ and no leading zero in the block, then sum them (deduplicated) and print the tot
 """
 import sys
 import argparse
-from math import ceil
+
+import repeat_index
 
 
 def iter_ranges_from_line(line):
@@ -26,34 +27,49 @@ def iter_ranges_from_line(line):
         yield lo, hi
 
 
+def mobius(n: int) -> int:
+    result = 1
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            result = -result
+        p += 1
+    if n > 1:
+        result = -result
+    return result
+
+
+def sum_periodic(lo: int, hi: int, L: int, k: int) -> int:
+    # sum of L-digit numbers in [lo, hi] made of a k-digit block repeated L//k times:
+    # each is base * (10**L - 1) // (10**k - 1), an arithmetic series over base
+    mult = (10 ** L - 1) // (10 ** k - 1)
+    first = max(10 ** (k - 1), -(-lo // mult))
+    last = min(10 ** k - 1, hi // mult)
+    if first > last:
+        return 0
+    return mult * (first + last) * (last - first + 1) // 2
+
+
 def sum_invalid_in_range(lo: int, hi: int) -> int:
-    found = set()
+    # For a fixed length L, the numbers with period k (k | L) and period k'
+    # are exactly those with period gcd(k, k'), so by Mobius inversion the
+    # L-digit numbers with some period k < L sum to
+    #   -sum over k | L, k < L of mobius(L // k) * sum_periodic(L, k)
+    # No dedup set and no string building; polylog in the bounds.
+    total = 0
     lo_len = len(str(lo))
     hi_len = len(str(hi))
-
-    # base length k must be at least 1, and at most hi_len//2 (since r>=2)
-    max_k = hi_len // 2
-    for k in range(1, max_k + 1):
-        # possible repeat counts r so that total length L = k*r falls within [lo_len, hi_len]
-        r_min = max(2, ceil(lo_len / k))
-        r_max = hi_len // k
-        if r_min > r_max:
-            continue
-
-        start = 10 ** (k - 1)
-        end = 10 ** k - 1
-        for r in range(r_min, r_max + 1):
-            # for fixed r, values increase with base; we can break early when exceeding hi
-            for base in range(start, end + 1):
-                s = str(base) * r
-                val = int(s)
-                if val < lo:
-                    continue
-                if val > hi:
-                    break
-                found.add(val)
-
-    return sum(found)
+    for L in range(max(lo_len, 2), hi_len + 1):
+        for k in range(1, L // 2 + 1):
+            if L % k != 0:
+                continue
+            mu = mobius(L // k)
+            if mu:
+                total -= mu * sum_periodic(lo, hi, L, k)
+    return total
 
 
 def solve_ranges_line(line: str) -> int:
@@ -66,6 +82,9 @@ def solve_ranges_line(line: str) -> int:
 def main(argv=None):
     parser = argparse.ArgumentParser(description='Sum invalid repeated-block IDs (r>=2)')
     parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+    parser.add_argument('--index', help='repeated-ID index file to query (built on first use)')
+    parser.add_argument('--index-digits', type=int, default=12,
+        help='largest ID length covered when building the index (default: 12)')
     args = parser.parse_args(argv)
 
     if args.input_file:
@@ -79,6 +98,15 @@ def main(argv=None):
         print(0)
         return
 
+    if args.index:
+        try:
+            index = repeat_index.load_or_build(args.index, args.index_digits, 'any')
+            # overlapping ranges are merged first, so shared IDs count once
+            print(index.sum_ranges(iter_ranges_from_line(content)))
+        except ValueError as e:
+            parser.error(str(e))
+        return
+
     print(solve_ranges_line(content))
 
 
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Precomputed index of repeated-block IDs for batch range queries.
+
+Every invalid ID up to a configurable digit count is generated once, in
+sorted order, together with its prefix sums. Both live in compact uint64
+buffers ('Q' arrays) that can be saved and later memory-mapped, so a range
+costs two bisects instead of a fresh enumeration.
+
+Two kinds of index exist, matching the two puzzles:
+  'double' - a block repeated exactly twice (puzzle3)
+  'any'    - a block repeated two or more times (puzzle4)
+
+File layout (native byte order, little-endian on every box we run):
+  8 bytes   magic b'AOCRIDX1'
+  8 bytes   kind (0 = double, 1 = any)
+  8 bytes   max_digits
+  8 bytes   count
+  count * 8 bytes       numbers
+  (count + 1) * 8 bytes prefix sums, prefix[0] == 0
+"""
+import sys
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+MAGIC = b'AOCRIDX1'
+KINDS = ('double', 'any')
+_HEADER = struct.Struct('=8sQQQ')
+_U64_MAX = (1 << 64) - 1
+
+
+def iter_repeated(max_digits, kind='any'):
+	"""Yield repeated-block numbers with at most max_digits digits, ascending."""
+	for L in range(2, max_digits + 1):
+		if kind == 'double':
+			if L % 2:
+				continue
+			blocks = [L // 2]
+		else:
+			blocks = [k for k in range(1, L // 2 + 1) if L % k == 0]
+		vals = set()
+		for k in blocks:
+			mult = (10 ** L - 1) // (10 ** k - 1)
+			vals.update(base * mult for base in range(10 ** (k - 1), 10 ** k))
+		yield from sorted(vals)
+
+
+def _block_sum(k):
+	# sum of all k-digit numbers (the possible blocks)
+	lo, hi = 10 ** (k - 1), 10 ** k - 1
+	return (lo + hi) * (hi - lo + 1) // 2
+
+
+def length_sum(L, kind='any'):
+	"""Sum of the L-digit numbers iter_repeated yields, in closed form."""
+	if kind == 'double':
+		if L % 2:
+			return 0
+		return (10 ** (L // 2) + 1) * _block_sum(L // 2)
+	# split by smallest period d: prim[d] sums the d-digit blocks that are
+	# not themselves repeats, and such a block repeated fills L digits once
+	prim = {}
+	total = 0
+	for d in range(1, L // 2 + 1):
+		if L % d:
+			continue
+		prim[d] = _block_sum(d) - sum(
+			v * ((10 ** d - 1) // (10 ** e - 1)) for e, v in prim.items() if d % e == 0)
+		total += prim[d] * ((10 ** L - 1) // (10 ** d - 1))
+	return total
+
+
+def merge_ranges(ranges):
+	# overlapping or touching ranges collapse so shared IDs count once
+	ranges = sorted(ranges)
+	merged = []
+	for lo, hi in ranges:
+		if merged and lo <= merged[-1][1] + 1:
+			if hi > merged[-1][1]:
+				merged[-1][1] = hi
+		else:
+			merged.append([lo, hi])
+	return [(lo, hi) for lo, hi in merged]
+
+
+class RepeatIndex:
+	"""Sorted repeated-block numbers with prefix sums.
+
+	nums and prefix are any uint64 sequences supporting len() and indexing:
+	'Q' arrays when built in memory, memoryviews over an mmap when loaded.
+	"""
+
+	def __init__(self, kind, max_digits, nums, prefix, _mm=None):
+		self.kind = kind
+		self.max_digits = max_digits
+		self.nums = nums
+		self.prefix = prefix
+		self._mm = _mm
+
+	@classmethod
+	def build(cls, max_digits, kind='any'):
+		if kind not in KINDS:
+			raise ValueError(f'unknown index kind {kind!r}')
+		run = 0
+		for L in range(2, max_digits + 1):
+			run += length_sum(L, kind)
+			if run > _U64_MAX:
+				raise ValueError(f'prefix sums overflow uint64 at {L} digits')
+		nums = array('Q')
+		prefix = array('Q', [0])
+		run = 0
+		for val in iter_repeated(max_digits, kind):
+			run += val
+			nums.append(val)
+			prefix.append(run)
+		return cls(kind, max_digits, nums, prefix)
+
+	def save(self, path):
+		with open(path, 'wb') as f:
+			f.write(_HEADER.pack(MAGIC, KINDS.index(self.kind), self.max_digits, len(self.nums)))
+			array('Q', self.nums).tofile(f)
+			array('Q', self.prefix).tofile(f)
+
+	@classmethod
+	def load(cls, path):
+		"""Memory-map an index written by save(); nothing is parsed or copied."""
+		with open(path, 'rb') as f:
+			mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, kind, max_digits, count = _HEADER.unpack_from(mm, 0)
+		if magic != MAGIC or kind >= len(KINDS):
+			mm.close()
+			raise ValueError(f'{path}: not a repeated-ID index')
+		if sys.byteorder != 'little':
+			mm.close()
+			raise ValueError(f'{path}: index files are little-endian')
+		view = memoryview(mm)
+		start = _HEADER.size
+		nums = view[start:start + 8 * count].cast('Q')
+		prefix = view[start + 8 * count:start + 8 * (2 * count + 1)].cast('Q')
+		return cls(KINDS[kind], max_digits, nums, prefix, mm)
+
+	def sum_range(self, lo, hi):
+		if hi >= 10 ** self.max_digits:
+			raise ValueError(f'{hi} is beyond the index ({self.max_digits} digits)')
+		i = bisect_left(self.nums, lo)
+		j = bisect_right(self.nums, hi)
+		return self.prefix[j] - self.prefix[i]
+
+	def sum_ranges(self, ranges):
+		return sum(self.sum_range(lo, hi) for lo, hi in merge_ranges(ranges))
+
+
+def load_or_build(path, max_digits, kind):
+	"""Load the index at `path`, building and saving it first if it is missing
+	or covers fewer than max_digits digits."""
+	try:
+		index = RepeatIndex.load(path)
+	except FileNotFoundError:
+		index = None
+	if index is not None:
+		if index.kind != kind:
+			raise ValueError(f'{path} is a {index.kind!r} index, expected {kind!r}')
+		if index.max_digits >= max_digits:
+			return index
+		del index  # drop the old mapping before the file is rewritten
+	RepeatIndex.build(max_digits, kind).save(path)
+	return RepeatIndex.load(path)
@@ -0,0 +1,28 @@
+import random
+
+from puzzle3 import is_double_repeat, sum_invalid_in_range
+
+
+def brute_sum(lo, hi):
+	return sum(n for n in range(lo, hi + 1) if is_double_repeat(n))
+
+
+def test_matches_brute_force_on_every_small_range():
+	for lo in range(0, 130):
+		for hi in range(lo, 130):
+			assert sum_invalid_in_range(lo, hi) == brute_sum(lo, hi), (lo, hi)
+
+
+def test_matches_brute_force_on_random_ranges():
+	rng = random.Random(2025)
+	for _ in range(300):
+		lo = rng.randrange(0, 10 ** rng.randint(1, 6))
+		hi = lo + rng.randrange(0, 5000)
+		assert sum_invalid_in_range(lo, hi) == brute_sum(lo, hi), (lo, hi)
+
+
+def test_example_ranges():
+	assert sum_invalid_in_range(11, 22) == 11 + 22
+	assert sum_invalid_in_range(95, 115) == 99
+	assert sum_invalid_in_range(998, 1012) == 1010
+	assert sum_invalid_in_range(1188511880, 1188511890) == 1188511885
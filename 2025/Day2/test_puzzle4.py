@@ -0,0 +1,37 @@
+import random
+
+from puzzle4 import mobius, sum_invalid_in_range
+
+
+def is_repeat(n):
+    s = str(n)
+    L = len(s)
+    return any(L % k == 0 and s == s[:k] * (L // k) for k in range(1, L // 2 + 1))
+
+
+def brute_sum(lo, hi):
+    return sum(n for n in range(lo, hi + 1) if is_repeat(n))
+
+
+def test_mobius_small_values():
+    assert [mobius(n) for n in range(1, 13)] == [1, -1, -1, 0, -1, 1, -1, 0, 0, 1, -1, 0]
+
+
+def test_matches_brute_force_on_every_small_range():
+    for lo in range(0, 130):
+        for hi in range(lo, 130):
+            assert sum_invalid_in_range(lo, hi) == brute_sum(lo, hi), (lo, hi)
+
+
+def test_matches_brute_force_on_random_ranges():
+    rng = random.Random(2025)
+    for _ in range(300):
+        lo = rng.randrange(0, 10 ** rng.randint(1, 7))
+        hi = lo + rng.randrange(0, 5000)
+        assert sum_invalid_in_range(lo, hi) == brute_sum(lo, hi), (lo, hi)
+
+
+def test_lengths_with_several_periods():
+    # 6 and 12 digits have overlapping periods (1, 2, 3 and 1, 2, 3, 4, 6)
+    for lo in (100000, 111110, 999990, 121212121200, 999999999990):
+        assert sum_invalid_in_range(lo, lo + 3000) == brute_sum(lo, lo + 3000), lo
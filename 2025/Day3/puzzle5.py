@@ -2,36 +2,84 @@
 """Find and sum the largest two-digit numbers from lines of input."""
 
 import sys
+import argparse
 
-def max_two_digit_from_line(s: str) -> int:
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+	np = None
+
+# bytes.translate deletion table: every byte that is not an ASCII digit
+NON_DIGITS = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+def digits_only(line: bytes) -> bytes:
+	return line.translate(None, NON_DIGITS)
+
+def max_two_digit_from_line(s) -> int:
+	# s: digit string (str or bytes). Single pass: the best pair ending at j
+	# uses the largest digit seen before j as its tens digit.
+	if isinstance(s, str):
+		s = s.encode()
 	if len(s) < 2:
 		return 0
 	max_val = 0
-	for i in range(len(s) - 1):
-		a = ord(s[i]) - 48
-		for j in range(i + 1, len(s)):
-			b = ord(s[j]) - 48
-			val = 10 * a + b
-			if val > max_val:
-				max_val = val
+	best_a = s[0] - 48
+	for b in s[1:]:
+		b -= 48
+		val = 10 * best_a + b
+		if val > max_val:
+			max_val = val
+		if b > best_a:
+			best_a = b
 	return max_val
 
-def main():
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
-		with open(path, 'r') as f:
+def max_two_digit_batch(lines):
+	# lines: list of digit-only bytes; returns one answer per line.
+	# All lines are padded into a uint8 matrix and solved with max/argmax.
+	if np is None:
+		raise RuntimeError('--batch requires numpy')
+	if not lines:
+		return np.zeros(0, dtype=np.int64)
+	lens = np.fromiter((len(ln) for ln in lines), dtype=np.int64, count=len(lines))
+	width = int(lens.max())
+	mat = np.zeros((len(lines), width), dtype=np.uint8)
+	for r, ln in enumerate(lines):
+		mat[r, :len(ln)] = np.frombuffer(ln, dtype=np.uint8) - 48
+	cols = np.arange(width)
+	# tens digit: largest of all but the last digit, earliest occurrence
+	tens = np.where(cols < (lens - 1)[:, None], mat, 0)
+	a_idx = tens.argmax(axis=1)
+	a = tens[np.arange(len(lines)), a_idx].astype(np.int64)
+	# units digit: largest digit after the tens digit
+	units = np.where((cols > a_idx[:, None]) & (cols < lens[:, None]), mat, 0)
+	b = units.max(axis=1).astype(np.int64)
+	return np.where(lens >= 2, 10 * a + b, 0)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Sum the largest two-digit number of each line')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--batch', action='store_true', help='solve all lines at once with NumPy')
+	args = parser.parse_args(argv)
+
+	if args.input_file:
+		with open(args.input_file, 'rb') as f:
 			lines = [line.strip() for line in f]
 	else:
-		lines = [line.strip() for line in sys.stdin]
+		lines = [line.strip() for line in sys.stdin.buffer]
 
-	total = 0
+	banks = []
 	for line in lines:
 		if not line:
 			continue
-		digits = ''.join(ch for ch in line if ch.isdigit())
+		digits = digits_only(line)
 		if not digits:
 			continue
-		total += max_two_digit_from_line(digits)
+		banks.append(digits)
+
+	if args.batch:
+		total = int(max_two_digit_batch(banks).sum())
+	else:
+		total = sum(max_two_digit_from_line(digits) for digits in banks)
 
 	print(total)
 
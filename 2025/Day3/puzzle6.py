@@ -1,50 +1,119 @@
 import sys
+import argparse
+
+from puzzle5 import digits_only
 
 def max_k_digits_from_line(s: str, k: int) -> int:
 	# s: string of digits; return integer value of max k-digit subsequence (preserving order)
+	# Monotonic stack: a digit evicts smaller digits before it while we can
+	# still afford to drop n - k of them. O(n).
 	n = len(s)
 	if n < k:
 		return 0
-	pos = 0
-	remaining = k
-	digits = []
-	while remaining > 0:
-		# we must pick one digit from s[pos : n - remaining + 1] inclusive
-		end = n - remaining
-		# find max digit and its first index in the allowed window
-		max_d = '-1'
-		max_idx = pos
-		for idx in range(pos, end + 1):
-			ch = s[idx]
-			if ch > max_d:
-				max_d = ch
-				max_idx = idx
-				# early exit if we found '9'
-				if ch == '9':
-					break
-		digits.append(max_d)
-		pos = max_idx + 1
-		remaining -= 1
-	return int(''.join(digits))
-
-def main():
-	INPUT_K = 12
+	if k <= 0:
+		return 0
+	drops = n - k
+	stack = []
+	for ch in s:
+		while drops and stack and stack[-1] < ch:
+			stack.pop()
+			drops -= 1
+		stack.append(ch)
+	return int(''.join(stack[:k]))
+
+class RangeMax:
+	# sparse table over a digit string: max digit (earliest index on ties)
+	# of any window in O(1) after an O(n log n) build
+	def __init__(self, s: str):
+		n = len(s)
+		self.n = n
+		# key orders by digit, then by smaller index
+		level = [(ord(ch) - 48) * (n + 1) + (n - i) for i, ch in enumerate(s)]
+		self.table = [level]
+		width = 1
+		while 2 * width <= n:
+			prev = level
+			level = [max(prev[i], prev[i + width]) for i in range(n - 2 * width + 1)]
+			self.table.append(level)
+			width *= 2
+
+	def argmax(self, lo: int, hi: int):
+		# (digit, index) of the best digit in s[lo:hi+1]
+		j = (hi - lo + 1).bit_length() - 1
+		row = self.table[j]
+		key = max(row[lo], row[hi - (1 << j) + 1])
+		n = self.n
+		return key // (n + 1), n - key % (n + 1)
+
+def max_k_digits_multi(s: str, ks) -> dict:
+	# answer many k for one line: the table is built once, then each k costs
+	# O(k) window queries instead of another pass over the line
+	n = len(s)
+	rmq = RangeMax(s) if n else None
+	results = {}
+	for k in ks:
+		if k <= 0 or n < k:
+			results[k] = 0
+			continue
+		pos = 0
+		val = 0
+		for remaining in range(k, 0, -1):
+			d, idx = rmq.argmax(pos, n - remaining)
+			val = val * 10 + d
+			pos = idx + 1
+		results[k] = val
+	return results
+
+def parse_k_list(text: str):
+	# "1-64" or "2,4,12" or a mix like "1-3,12"
+	ks = []
+	for part in text.split(','):
+		part = part.strip()
+		if not part:
+			continue
+		if '-' in part:
+			a, b = part.split('-', 1)
+			ks.extend(range(int(a), int(b) + 1))
+		else:
+			ks.append(int(part))
+	return ks
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Sum the largest k-digit number of each line')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--k', type=int, default=12, help='digits to pick per line (default: 12)')
+	parser.add_argument('--k-list', type=parse_k_list,
+		help='answer several k at once, e.g. 1-64 or 2,4,12; prints "k total" per line')
+	args = parser.parse_args(argv)
+
 	# read input from file (first arg) or stdin
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
-		with open(path, 'r') as f:
+	if args.input_file:
+		with open(args.input_file, 'rb') as f:
 			lines = [line.strip() for line in f]
 	else:
-		lines = [line.strip() for line in sys.stdin]
+		lines = [line.strip() for line in sys.stdin.buffer]
 
-	total = 0
+	banks = []
 	for line in lines:
 		if not line:
 			continue
-		digits = ''.join(ch for ch in line if ch.isdigit())
+		digits = digits_only(line).decode()
 		if not digits:
 			continue
-		total += max_k_digits_from_line(digits, INPUT_K)
+		banks.append(digits)
+
+	if args.k_list:
+		totals = dict.fromkeys(args.k_list, 0)
+		for digits in banks:
+			for k, val in max_k_digits_multi(digits, totals).items():
+				totals[k] += val
+		for k, total in totals.items():
+			print(k, total)
+		return
+
+	total = 0
+	for digits in banks:
+		total += max_k_digits_from_line(digits, args.k)
 
 	print(total)
 
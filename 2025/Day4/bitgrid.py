@@ -0,0 +1,66 @@
+"""Row-bitset backend for the Day4 roll grid (pure Python, no NumPy).
+
+Each row is one int with bit c set when column c holds a roll. Neighbour
+counts are kept bit-sliced: plane i holds bit i of every cell's count, and
+the eight shifted neighbour rows are added with ripple-carry logic, so one
+int operation handles a whole row.
+"""
+
+# '@' -> '1', every other byte -> '0'
+_ROLL_BITS = bytes(49 if b == ord('@') else 48 for b in range(256))
+
+def row_masks(grid):
+	# grid: list of strings (or lists of chars)
+	rows = []
+	for row in grid:
+		if not isinstance(row, str):
+			row = ''.join(row)
+		bits = row.encode('latin-1', 'replace').translate(_ROLL_BITS)
+		rows.append(int(bits[::-1], 2) if bits else 0)
+	return rows
+
+def _add_plane(planes, x):
+	# add a 1-bit-per-cell plane into the bit-sliced counter (in place)
+	for i in range(len(planes)):
+		if not x:
+			return
+		planes[i], x = planes[i] ^ x, planes[i] & x
+	if x:
+		planes.append(x)
+
+def crowded(above, row, below):
+	# cells of `row`'s width with 4 or more rolls among their 8 neighbours
+	planes = []
+	for x in (above << 1, above, above >> 1, row << 1, row >> 1, below << 1, below, below >> 1):
+		if x:
+			_add_plane(planes, x)
+	# count >= 4 <=> any plane from bit 2 up is set
+	mask = 0
+	for p in planes[2:]:
+		mask |= p
+	return mask
+
+def accessible_rows(rows):
+	# per row, the rolls with fewer than 4 neighbouring rolls
+	h = len(rows)
+	out = []
+	for r in range(h):
+		above = rows[r - 1] if r > 0 else 0
+		below = rows[r + 1] if r + 1 < h else 0
+		out.append(rows[r] & ~crowded(above, rows[r], below))
+	return out
+
+def count_accessible_bits(grid):
+	return sum(m.bit_count() for m in accessible_rows(row_masks(grid)))
+
+def count_removable_bits(grid):
+	# same rounds as puzzle8.count_removable; grid is not modified
+	rows = row_masks(grid)
+	total = 0
+	while True:
+		removable = accessible_rows(rows)
+		n = sum(m.bit_count() for m in removable)
+		if n == 0:
+			return total
+		total += n
+		rows = [row & ~rem for row, rem in zip(rows, removable)]
@@ -0,0 +1,24 @@
+"""Flat padded layout of the Day4 roll grid, shared by the per-cell engines
+(puzzle8.count_removable_peel and core_index).
+
+Cells live in one bytearray with a one-cell empty border, row-major with
+stride w + 2, so the eight neighbours of cell i are i + d for d in offsets
+and need no bounds checks.
+"""
+
+def neighbour_counts(grid):
+	# grid: list of strings (or lists of chars), rows may differ in length.
+	# Returns (stride, present, offsets, degree): present[i] is 1 for a roll,
+	# degree maps every roll cell (ascending) to its neighbouring roll count.
+	h = len(grid)
+	w = max((len(row) for row in grid), default=0)
+	stride = w + 2
+	present = bytearray(stride * (h + 2))
+	for r, row in enumerate(grid):
+		base = (r + 1) * stride + 1
+		for c, ch in enumerate(row):
+			if ch == '@':
+				present[base + c] = 1
+	offsets = [-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1]
+	degree = {i: sum(present[i + d] for d in offsets) for i, v in enumerate(present) if v}
+	return stride, present, offsets, degree
@@ -1,4 +1,12 @@
 import sys
+import argparse
+
+from bitgrid import count_accessible_bits
+
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+	np = None
 
 def count_accessible(grid):
 	# grid: list of strings
@@ -22,17 +30,60 @@ def count_accessible(grid):
 				count += 1
 	return count
 
-def main():
+def grid_to_array(grid):
+	# boolean roll mask; short lines are padded with empty cells
+	h = len(grid)
+	w = max((len(row) for row in grid), default=0)
+	rolls = np.zeros((h, w), dtype=bool)
+	for r, row in enumerate(grid):
+		if row:
+			rolls[r, :len(row)] = np.frombuffer(row.encode('latin-1', 'replace'), dtype=np.uint8) == ord('@')
+	return rolls
+
+def neighbour_counts(rolls):
+	# 8-neighbour roll count of every cell: sum of shifted slices of a
+	# zero-padded copy, so the border needs no bounds checks
+	h, w = rolls.shape
+	padded = np.zeros((h + 2, w + 2), dtype=np.uint8)
+	padded[1:-1, 1:-1] = rolls
+	counts = np.zeros((h, w), dtype=np.uint8)
+	for dr in (0, 1, 2):
+		for dc in (0, 1, 2):
+			if dr == 1 and dc == 1:
+				continue
+			counts += padded[dr:dr + h, dc:dc + w]
+	return counts
+
+def count_accessible_array(grid):
+	# NumPy engine; same answer as count_accessible
+	if np is None:
+		raise RuntimeError('the array engine requires numpy')
+	if not grid:
+		return 0
+	rolls = grid_to_array(grid)
+	return int(np.count_nonzero(rolls & (neighbour_counts(rolls) < 4)))
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Count rolls reachable by a forklift')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--engine', choices=('bits', 'loop', 'array'), default='bits',
+		help='row-bitset, per-cell loop or NumPy array engine (default: bits)')
+	args = parser.parse_args(argv)
+
 	# read input from file (first arg) or stdin
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
-		with open(path, 'r') as f:
+	if args.input_file:
+		with open(args.input_file, 'r') as f:
 			lines = [line.rstrip('\n') for line in f]
 	else:
 		lines = [line.rstrip('\n') for line in sys.stdin]
 	# ignore empty trailing/leading lines
 	lines = [ln for ln in lines if ln != '']
-	print(count_accessible(lines))
+	if args.engine == 'array':
+		print(count_accessible_array(lines))
+	elif args.engine == 'loop':
+		print(count_accessible(lines))
+	else:
+		print(count_accessible_bits(lines))
 
 if __name__ == "__main__":
 	main()
@@ -1,4 +1,9 @@
 import sys
+import argparse
+
+from bitgrid import count_removable_bits
+from flatgrid import neighbour_counts
+from tiled import count_removable_tiled
 
 def count_removable(grid):
 	# grid: list of list of chars
@@ -30,19 +35,69 @@ def count_removable(grid):
 		total_removed += len(to_remove)
 	return total_removed
 
-def main():
+def count_removable_peel(grid, with_rounds=False):
+	# Worklist version of count_removable: neighbour counts are computed once,
+	# then each removal decrements its neighbours and only those that drop
+	# below 4 are queued for the next round. O(cells) overall, same rounds.
+	# grid is not modified. With with_rounds=True also returns a list of rows
+	# holding each cell's removal round (0 = never removed).
+	h = len(grid)
+	if h == 0:
+		return (0, []) if with_rounds else 0
+	stride, present, offsets, counts = neighbour_counts(grid)
+	removed_in = {}
+	frontier = [i for i, n in counts.items() if n < 4]
+	rnd = 0
+	while frontier:
+		rnd += 1
+		for i in frontier:
+			present[i] = 0
+			removed_in[i] = rnd
+		nxt = []
+		for i in frontier:
+			for d in offsets:
+				j = i + d
+				if present[j]:
+					counts[j] -= 1
+					if counts[j] == 3:
+						nxt.append(j)
+		frontier = nxt
+	total = len(removed_in)
+	if not with_rounds:
+		return total
+	rounds = [[0] * len(row) for row in grid]
+	for i, rd in removed_in.items():
+		r, c = divmod(i, stride)
+		rounds[r - 1][c - 1] = rd
+	return total, rounds
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Count rolls removable by repeated forklift passes')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--engine', choices=('bits', 'rounds', 'peel', 'tiled'), default='bits',
+		help='row-bitset rounds, per-cell rounds, incremental worklist peel or '
+		'multi-process row bands (default: bits)')
+	parser.add_argument('--workers', type=int, default=None,
+		help='row bands for --engine tiled (default: CPU count)')
+	args = parser.parse_args(argv)
+
 	# read input from file (first arg) or stdin
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
-		with open(path, 'r') as f:
+	if args.input_file:
+		with open(args.input_file, 'r') as f:
 			lines = [line.rstrip('\n') for line in f]
 	else:
 		lines = [line.rstrip('\n') for line in sys.stdin]
 	# ignore empty lines
 	lines = [ln for ln in lines if ln != '']
-	# convert to mutable grid
-	grid = [list(ln) for ln in lines]
-	print(count_removable(grid))
+	if args.engine == 'peel':
+		print(count_removable_peel(lines))
+	elif args.engine == 'tiled':
+		print(count_removable_tiled(lines, args.workers))
+	elif args.engine == 'rounds':
+		# count_removable edits cells in place, so it needs mutable rows
+		print(count_removable([list(ln) for ln in lines]))
+	else:
+		print(count_removable_bits(lines))
 
 if __name__ == "__main__":
 	main()
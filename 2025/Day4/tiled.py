@@ -0,0 +1,113 @@
+"""Tiled multi-process peel for Day4 grids too big for one core.
+
+The grid is split into row bands, one worker process each. The raw grid is
+placed in shared memory and every worker loads only its own band, as row
+bitsets (see bitgrid). Peel rounds run in lockstep between two barriers:
+
+  1. each band computes its removals, reading its 1-row halo (the last row
+     of the band above and the first row of the band below) from shared
+     boundary slots;
+  2. barrier; each band applies its removals, republishes its own first and
+     last row into the slots, and reports how many cells it removed;
+  3. barrier; when no band removed anything, everyone stops.
+
+Removals within a round are decided before any are applied, so the result
+is the same as the serial puzzle8.count_removable.
+"""
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+from bitgrid import row_masks, crowded
+
+
+def _band_worker(grid_name, halo_name, h, w, r0, r1, band, n_bands, barrier, removed, totals):
+	nbytes = (w + 7) // 8
+	grid_shm = shared_memory.SharedMemory(name=grid_name)
+	halo_shm = shared_memory.SharedMemory(name=halo_name)
+	try:
+		raw = grid_shm.buf
+		rows = row_masks([bytes(raw[r * w:(r + 1) * w]).decode('latin-1') for r in range(r0, r1)])
+		halo = halo_shm.buf
+
+		def slot(b, side):
+			# side 0: first row of band b, side 1: last row of band b
+			off = (2 * b + side) * nbytes
+			return off, off + nbytes
+
+		def publish():
+			for side, row in ((0, rows[0]), (1, rows[-1])):
+				a, z = slot(band, side)
+				halo[a:z] = row.to_bytes(nbytes, 'little')
+
+		def read(b, side):
+			a, z = slot(b, side)
+			return int.from_bytes(halo[a:z], 'little')
+
+		publish()
+		barrier.wait()
+		total = 0
+		while True:
+			above = read(band - 1, 1) if band > 0 else 0
+			below = read(band + 1, 0) if band + 1 < n_bands else 0
+			ext = [above] + rows + [below]
+			removable = [ext[i] & ~crowded(ext[i - 1], ext[i], ext[i + 1]) for i in range(1, len(ext) - 1)]
+			barrier.wait()  # every band has read its halo for this round
+			n = 0
+			for i, rem in enumerate(removable):
+				if rem:
+					n += rem.bit_count()
+					rows[i] &= ~rem
+			publish()
+			removed[band] = n
+			total += n
+			barrier.wait()  # every band has applied and published
+			if not any(removed[b] for b in range(n_bands)):
+				break
+		totals[band] = total
+	except BaseException:
+		barrier.abort()  # release the other bands instead of leaving them waiting
+		raise
+	finally:
+		grid_shm.close()
+		halo_shm.close()
+
+
+def count_removable_tiled(grid, workers=None):
+	# grid: list of strings; not modified
+	h = len(grid)
+	if h == 0:
+		return 0
+	w = max(len(row) for row in grid)
+	if w == 0:
+		return 0
+	n_bands = max(1, min(workers or os.cpu_count() or 1, h))
+	nbytes = (w + 7) // 8
+	ctx = mp.get_context()
+	grid_shm = shared_memory.SharedMemory(create=True, size=h * w)
+	halo_shm = shared_memory.SharedMemory(create=True, size=2 * n_bands * nbytes)
+	try:
+		for r, row in enumerate(grid):
+			grid_shm.buf[r * w:(r + 1) * w] = row.encode('latin-1', 'replace').ljust(w, b'.')
+		barrier = ctx.Barrier(n_bands)
+		removed = ctx.Array('q', n_bands, lock=False)
+		totals = ctx.Array('q', n_bands, lock=False)
+		bounds = [h * b // n_bands for b in range(n_bands + 1)]
+		procs = [
+			ctx.Process(target=_band_worker, args=(
+				grid_shm.name, halo_shm.name, h, w, bounds[b], bounds[b + 1],
+				b, n_bands, barrier, removed, totals))
+			for b in range(n_bands)
+		]
+		for p in procs:
+			p.start()
+		for p in procs:
+			p.join()
+		if any(p.exitcode != 0 for p in procs):
+			raise RuntimeError('a band worker failed')
+		return sum(totals)
+	finally:
+		grid_shm.close()
+		grid_shm.unlink()
+		halo_shm.close()
+		halo_shm.unlink()
@@ -0,0 +1,100 @@
+"""Merged fresh-ID ranges, shared by puzzle9 and puzzle10, plus a compiled
+on-disk form of them.
+
+The range catalogue changes rarely while ID batches arrive constantly, so the
+merged intervals can be compiled once into an index file and memory-mapped
+by later runs: no parsing, sorting or merging per batch.
+
+Index file layout (little-endian):
+  8 bytes   magic b'AOCIVL1\\0'
+  8 bytes   count, uint64
+  count * 8 bytes   interval starts, uint64, ascending
+  count * 8 bytes   interval ends (inclusive), uint64
+"""
+import sys
+import mmap
+import struct
+from array import array
+
+MAGIC = b'AOCIVL1\0'
+_HEADER = struct.Struct('<8sQ')
+
+def parse_ranges(range_lines):
+	ranges = []
+	for ln in range_lines:
+		if '-' not in ln:
+			continue
+		a, b = ln.split('-', 1)
+		try:
+			s = int(a)
+			e = int(b)
+		except ValueError:
+			continue
+		if s > e:
+			s, e = e, s
+		ranges.append((s, e))
+	return ranges
+
+def merge_intervals(intervals):
+	if not intervals:
+		return []
+	intervals.sort()
+	merged = []
+	cur_s, cur_e = intervals[0]
+	for s, e in intervals[1:]:
+		if s <= cur_e + 1:
+			if e > cur_e:
+				cur_e = e
+		else:
+			merged.append((cur_s, cur_e))
+			cur_s, cur_e = s, e
+	merged.append((cur_s, cur_e))
+	return merged
+
+class IntervalIndex:
+	# starts/ends: uint64 sequences ('Q' arrays, or memoryviews over an mmap)
+	def __init__(self, starts, ends, _mm=None):
+		self.starts = starts
+		self.ends = ends
+		self._mm = _mm
+
+	def __len__(self):
+		return len(self.starts)
+
+	@classmethod
+	def from_ranges(cls, ranges):
+		merged = merge_intervals(list(ranges))
+		return cls(array('Q', [s for s, _ in merged]), array('Q', [e for _, e in merged]))
+
+	def save(self, path):
+		starts = array('Q', self.starts)
+		ends = array('Q', self.ends)
+		if sys.byteorder != 'little':
+			starts.byteswap()
+			ends.byteswap()
+		with open(path, 'wb') as f:
+			f.write(_HEADER.pack(MAGIC, len(starts)))
+			starts.tofile(f)
+			ends.tofile(f)
+
+	@classmethod
+	def load(cls, path):
+		with open(path, 'rb') as f:
+			mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, count = _HEADER.unpack_from(mm, 0)
+		if magic != MAGIC or len(mm) != _HEADER.size + 16 * count:
+			mm.close()
+			raise ValueError(f'{path}: not an interval index')
+		if sys.byteorder != 'little':
+			# rare: fall back to a swapped in-memory copy
+			starts = array('Q', mm[_HEADER.size:_HEADER.size + 8 * count])
+			ends = array('Q', mm[_HEADER.size + 8 * count:])
+			starts.byteswap()
+			ends.byteswap()
+			mm.close()
+			return cls(starts, ends)
+		view = memoryview(mm)
+		off = _HEADER.size
+		starts = view[off:off + 8 * count].cast('Q')
+		ends = view[off + 8 * count:off + 16 * count].cast('Q')
+		return cls(starts, ends, mm)
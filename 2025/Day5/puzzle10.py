@@ -1,4 +1,9 @@
 import sys
+import argparse
+from bisect import bisect_left
+from collections import Counter
+
+from interval_index import merge_intervals, parse_ranges as parse_intervals
 
 def parse_ranges_section(lines):
 	# split at first blank line
@@ -13,45 +18,101 @@ def parse_ranges_section(lines):
 		section = [ln.strip() for ln in lines[:sep] if ln.strip() != '']
 	return section
 
-def parse_intervals(lines):
-	ints = []
+class CoverageTree:
+	# Segment tree with cover counts over coordinate-compressed boundaries.
+	# Leaf i stands for the IDs [coords[i], coords[i+1]); a node's covered
+	# length is its full span when some range covers all of it, else the sum
+	# of its children. add/remove are O(log n) and covered is O(1).
+	# Every range ever added must be known up front (see from_events).
+	def __init__(self, ranges):
+		coords = sorted({s for s, _ in ranges} | {e + 1 for _, e in ranges})
+		self.coords = coords
+		self.n = max(len(coords) - 1, 0)
+		size = 4 * max(self.n, 1)
+		self.cover = [0] * size
+		self.length = [0] * size
+		self.active = Counter()
+
+	@classmethod
+	def from_events(cls, events):
+		return cls([rng for _, rng in events])
+
+	@property
+	def covered(self):
+		return self.length[1] if self.n else 0
+
+	def add(self, s, e):
+		self.active[(s, e)] += 1
+		self._update(s, e, 1)
+
+	def remove(self, s, e):
+		if not self.active[(s, e)]:
+			raise ValueError(f'range {s}-{e} is not present')
+		self.active[(s, e)] -= 1
+		self._update(s, e, -1)
+
+	def _update(self, s, e, delta):
+		lo = bisect_left(self.coords, s)
+		hi = bisect_left(self.coords, e + 1)
+		if lo >= hi or self.coords[lo] != s or hi > self.n:
+			raise ValueError(f'range {s}-{e} was not declared to the tree')
+		self._apply(1, 0, self.n, lo, hi, delta)
+
+	def _apply(self, node, nlo, nhi, lo, hi, delta):
+		# node spans leaves [nlo, nhi); update leaves [lo, hi)
+		if hi <= nlo or nhi <= lo:
+			return
+		if lo <= nlo and nhi <= hi:
+			self.cover[node] += delta
+		else:
+			mid = (nlo + nhi) // 2
+			self._apply(2 * node, nlo, mid, lo, hi, delta)
+			self._apply(2 * node + 1, mid, nhi, lo, hi, delta)
+		if self.cover[node] > 0:
+			self.length[node] = self.coords[nhi] - self.coords[nlo]
+		elif nhi - nlo == 1:
+			self.length[node] = 0
+		else:
+			self.length[node] = self.length[2 * node] + self.length[2 * node + 1]
+
+def parse_events(lines):
+	# one event per line: '+' or '-' followed by a range, e.g. "+3-5", "- 3-5"
+	events = []
 	for ln in lines:
-		if '-' not in ln:
-			continue
-		a, b = ln.split('-', 1)
-		try:
-			s = int(a)
-			e = int(b)
-		except ValueError:
+		ln = ln.strip()
+		if not ln or ln[0] not in '+-':
 			continue
-		if s > e:
-			s, e = e, s
-		ints.append((s, e))
-	return ints
-
-def merge_intervals(intervals):
-	if not intervals:
-		return []
-	intervals.sort()
-	merged = []
-	cs, ce = intervals[0]
-	for s, e in intervals[1:]:
-		if s <= ce + 1:
-			if e > ce:
-				ce = e
+		rng = parse_intervals([ln[1:].strip()])
+		if rng:
+			events.append((ln[0], rng[0]))
+	return events
+
+def replay_events(events):
+	# covered ID count after each event
+	tree = CoverageTree.from_events(events)
+	for op, (s, e) in events:
+		if op == '+':
+			tree.add(s, e)
 		else:
-			merged.append((cs, ce))
-			cs, ce = s, e
-	merged.append((cs, ce))
-	return merged
-
-def main():
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
-		with open(path, 'r') as f:
+			tree.remove(s, e)
+		yield tree.covered
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Count IDs covered by the fresh ranges')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--events', action='store_true',
+		help='input is a stream of +range/-range events; print the covered count after each')
+	args = parser.parse_args(argv)
+
+	if args.input_file:
+		with open(args.input_file, 'r') as f:
 			lines = [ln.rstrip('\n') for ln in f]
 	else:
 		lines = [ln.rstrip('\n') for ln in sys.stdin]
+	if args.events:
+		for covered in replay_events(parse_events(lines)):
+			print(covered)
+		return
 	ranges_lines = parse_ranges_section(lines)
 	intervals = parse_intervals(ranges_lines)
 	merged = merge_intervals(intervals)
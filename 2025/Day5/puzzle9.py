@@ -1,5 +1,19 @@
+import os
 import sys
+import time
+import heapq
+import argparse
+import tempfile
+from array import array
 from bisect import bisect_right
+from itertools import islice
+
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+	np = None
+
+from interval_index import IntervalIndex, parse_ranges, merge_intervals
 
 def parse_sections(lines):
 	# split at first blank line into ranges_section and ids_section
@@ -14,43 +28,16 @@ def parse_sections(lines):
 	ids = [ln.strip() for ln in lines[sep+1:] if ln.strip() != '']
 	return ranges, ids
 
-def parse_ranges(range_lines):
-	ranges = []
-	for ln in range_lines:
-		if '-' not in ln:
-			continue
-		a, b = ln.split('-', 1)
-		try:
-			s = int(a)
-			e = int(b)
-		except ValueError:
-			continue
-		if s > e:
-			s, e = e, s
-		ranges.append((s, e))
-	return ranges
-
-def merge_intervals(intervals):
-	if not intervals:
-		return []
-	intervals.sort()
-	merged = []
-	cur_s, cur_e = intervals[0]
-	for s, e in intervals[1:]:
-		if s <= cur_e + 1:
-			if e > cur_e:
-				cur_e = e
-		else:
-			merged.append((cur_s, cur_e))
-			cur_s, cur_e = s, e
-	merged.append((cur_s, cur_e))
-	return merged
-
 def count_fresh(ids, merged):
 	# Use binary search on interval start points
+	# merged: list of (start, end) tuples or an IntervalIndex
 	if not merged:
 		return 0
-	starts = [s for s, _ in merged]
+	if isinstance(merged, IntervalIndex):
+		starts, ends = merged.starts, merged.ends
+	else:
+		starts = [s for s, _ in merged]
+		ends = [e for _, e in merged]
 	count = 0
 	for id_str in ids:
 		try:
@@ -59,20 +46,201 @@ def count_fresh(ids, merged):
 			continue
 		# find rightmost interval whose start <= x
 		i = bisect_right(starts, x) - 1
-		if i >= 0 and merged[i][0] <= x <= merged[i][1]:
+		if i >= 0 and x <= ends[i]:
 			count += 1
 	return count
 
-def main():
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
-		with open(path, 'r') as f:
+_INT64_MIN, _INT64_END = -(1 << 63), 1 << 63
+
+def _split_ids(chunk):
+	# slow path for a chunk that does not parse as int64: malformed lines are
+	# skipped like count_fresh does, and IDs outside int64 come back apart
+	ids = []
+	wide = []
+	for id_str in chunk:
+		try:
+			x = int(id_str)
+		except ValueError:
+			continue
+		if _INT64_MIN <= x < _INT64_END:
+			ids.append(x)
+		else:
+			wide.append(x)
+	return ids, wide
+
+def count_fresh_chunked(id_lines, merged, chunk_rows=1 << 20):
+	# id_lines: iterable of ID lines (bytes or str), e.g. an open file already
+	# past the ranges section. Lines are parsed chunk_rows at a time into int64
+	# arrays and classified with searchsorted, so peak memory follows the
+	# chunk size rather than the batch size. IDs outside int64, and every ID
+	# when a range bound is, go through count_fresh instead.
+	if np is None:
+		raise RuntimeError('--chunk-rows requires numpy')
+	if not merged:
+		return 0
+	if isinstance(merged, IntervalIndex):
+		lo, hi = merged.starts[0], merged.ends[-1]
+	else:
+		lo, hi = merged[0][0], merged[-1][1]
+	# merged intervals are sorted and disjoint, so these are the extremes
+	narrow = _INT64_MIN <= lo and hi < _INT64_END
+	if narrow:
+		if isinstance(merged, IntervalIndex):
+			starts = np.asarray(merged.starts).astype(np.int64)
+			ends = np.asarray(merged.ends).astype(np.int64)
+		else:
+			starts = np.array([s for s, _ in merged], dtype=np.int64)
+			ends = np.array([e for _, e in merged], dtype=np.int64)
+	it = iter(id_lines)
+	count = 0
+	while True:
+		raw = list(islice(it, chunk_rows))
+		if not raw:
+			break
+		chunk = [ln for ln in (r.strip() for r in raw) if ln]
+		if not narrow:
+			count += count_fresh(chunk, merged)
+			continue
+		try:
+			ids = np.array(chunk, dtype=np.int64)
+		except (ValueError, OverflowError):
+			ids, wide = _split_ids(chunk)
+			count += count_fresh(wide, merged)
+			ids = np.array(ids, dtype=np.int64)
+		if ids.size:
+			i = np.searchsorted(starts, ids, side='right') - 1
+			count += int(np.count_nonzero((i >= 0) & (ids <= ends[np.maximum(i, 0)])))
+	return count
+
+def _spill_run(ids, spill_dir):
+	ids.sort()
+	fd, path = tempfile.mkstemp(prefix='ids-', suffix='.run', dir=spill_dir)
+	with os.fdopen(fd, 'wb') as f:
+		array('Q', ids).tofile(f)
+	return path
+
+def _read_run(path, block=1 << 16):
+	with open(path, 'rb') as f:
+		while True:
+			buf = array('Q')
+			try:
+				buf.fromfile(f, block)
+			except EOFError:
+				pass  # short final block; buf holds what was read
+			if not buf:
+				return
+			yield from buf
+
+def count_fresh_external(id_lines, merged, run_rows=1 << 22, spill_dir=None):
+	# External-memory variant for ID batches larger than RAM: IDs are sorted
+	# into runs of run_rows and spilled to disk as uint64, then one k-way
+	# merge of the runs is joined linearly against the merged intervals
+	# (sequential I/O, O(1) work per ID after sorting).
+	# Returns (count, stats) with ids, runs, spill_bytes, seconds, ids_per_s.
+	t0 = time.perf_counter()
+	runs = []
+	n_ids = 0
+	with tempfile.TemporaryDirectory(prefix='aoc-day5-', dir=spill_dir) as tmp:
+		buf = []
+		for raw in id_lines:
+			try:
+				x = int(raw)
+			except ValueError:
+				continue
+			if x < 0 or x >> 64:
+				continue  # outside uint64 runs; ranges are non-negative, so never fresh
+			buf.append(x)
+			if len(buf) >= run_rows:
+				runs.append(_spill_run(buf, tmp))
+				n_ids += len(buf)
+				buf = []
+		if buf:
+			runs.append(_spill_run(buf, tmp))
+			n_ids += len(buf)
+		spill_bytes = sum(os.path.getsize(p) for p in runs)
+
+		count = 0
+		j = 0
+		intervals = merged if not isinstance(merged, IntervalIndex) else list(zip(merged.starts, merged.ends))
+		n_int = len(intervals)
+		for x in heapq.merge(*(_read_run(p) for p in runs)):
+			while j < n_int and intervals[j][1] < x:
+				j += 1
+			if j == n_int:
+				break
+			if intervals[j][0] <= x:
+				count += 1
+	seconds = time.perf_counter() - t0
+	stats = {
+		'ids': n_ids,
+		'runs': len(runs),
+		'spill_bytes': spill_bytes,
+		'seconds': seconds,
+		'ids_per_s': n_ids / seconds if seconds > 0 else float('inf'),
+	}
+	return count, stats
+
+def read_ranges_section(f):
+	# consume lines of f up to and including the first blank line; returns
+	# (range_lines, has_ids) with the same split rules as parse_sections
+	ranges = []
+	for ln in f:
+		if ln.strip() == '':
+			return ranges, bool(ranges)
+		ranges.append(ln.strip())
+	return ranges, False
+
+def load_merged(ranges_section, args):
+	if args.index:
+		if args.rebuild or not os.path.exists(args.index):
+			IntervalIndex.from_ranges(parse_ranges(ranges_section)).save(args.index)
+		return IntervalIndex.load(args.index)
+	intervals = parse_ranges(ranges_section)
+	return merge_intervals(intervals)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Count fresh ingredient IDs')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--index', help='compiled interval index; built from the ranges section if missing')
+	parser.add_argument('--rebuild', action='store_true', help='rebuild --index from the ranges section')
+	parser.add_argument('--chunk-rows', type=int,
+		help='stream the IDs through NumPy this many lines at a time')
+	parser.add_argument('--external', action='store_true',
+		help='sort the IDs into runs spilled to disk, then merge-join them with the ranges')
+	parser.add_argument('--run-rows', type=int, default=1 << 22, help='IDs per sorted run for --external')
+	parser.add_argument('--spill-dir', help='directory for --external runs (default: system temp)')
+	args = parser.parse_args(argv)
+	if args.chunk_rows is not None and args.chunk_rows < 1:
+		parser.error('--chunk-rows must be at least 1')
+	if args.run_rows < 1:
+		parser.error('--run-rows must be at least 1')
+
+	if args.external or args.chunk_rows is not None:
+		f = open(args.input_file, 'r') if args.input_file else sys.stdin
+		try:
+			ranges_section, has_ids = read_ranges_section(f)
+			merged = load_merged(ranges_section, args)
+			if not has_ids:
+				print(0)
+			elif args.external:
+				count, stats = count_fresh_external(f, merged, args.run_rows, args.spill_dir)
+				print(count)
+				print(f"ids:{stats['ids']} runs:{stats['runs']} spill_bytes:{stats['spill_bytes']} "
+					f"ids_per_s:{stats['ids_per_s']:.0f}", file=sys.stderr)
+			else:
+				print(count_fresh_chunked(f, merged, args.chunk_rows))
+		finally:
+			if f is not sys.stdin:
+				f.close()
+		return
+
+	if args.input_file:
+		with open(args.input_file, 'r') as f:
 			lines = [ln.rstrip('\n') for ln in f]
 	else:
 		lines = [ln.rstrip('\n') for ln in sys.stdin]
 	ranges_section, ids_section = parse_sections(lines)
-	intervals = parse_ranges(ranges_section)
-	merged = merge_intervals(intervals)
+	merged = load_merged(ranges_section, args)
 	print(count_fresh(ids_section, merged))
 
 if __name__ == "__main__":
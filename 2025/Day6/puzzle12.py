@@ -1,11 +1,12 @@
 import sys
-from functools import reduce
-import operator
+import argparse
+from functools import partial
 
-def read_lines():
+from worksheet import column_groups, stream_groups, apply_op, TreeSum
+
+def read_lines(path=None):
 	# ...existing code...
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
+	if path:
 		with open(path, 'r') as f:
 			lines = [ln.rstrip('\n') for ln in f]
 	else:
@@ -13,28 +14,15 @@ def read_lines():
 	return lines
 
 def find_column_groups(lines):
+	# returns the rows as-is (no padding) and the (start, end) column groups
 	if not lines:
 		return [], []
-	width = max(len(ln) for ln in lines)
-	grid = [ln.ljust(width) for ln in lines]
-	col_has = [any(grid[r][c] != ' ' for r in range(len(grid))) for c in range(width)]
-	groups = []
-	in_group = False
-	start = 0
-	for c, has in enumerate(col_has):
-		if has and not in_group:
-			in_group = True
-			start = c
-		elif not has and in_group:
-			groups.append((start, c - 1))
-			in_group = False
-	if in_group:
-		groups.append((start, width - 1))
-	return grid, groups
+	return lines, column_groups(lines)
 
-def parse_and_eval_group(grid, start, end):
+def parse_and_eval_group(grid, start, end, mod=None):
 	# determine non-empty rows in this group's span
-	row_has = [any(grid[r][c] != ' ' for c in range(start, end+1)) for r in range(len(grid))]
+	# rows may be shorter than the group; missing cells count as spaces
+	row_has = [row[start:end+1].strip(' ') != '' for row in grid]
 	non_empty_rows = [i for i, v in enumerate(row_has) if v]
 	if not non_empty_rows:
 		return 0
@@ -52,24 +40,37 @@ def parse_and_eval_group(grid, start, end):
 	# collect numbers: for each column from right to left, gather digits from rows 0..op_row_idx-1 (top->bottom)
 	nums = []
 	for c in range(end, start - 1, -1):
-		digits = ''.join(grid[r][c] for r in range(0, op_row_idx) if grid[r][c].isdigit())
+		digits = ''.join(row[c] for row in grid[:op_row_idx] if c < len(row) and row[c].isdigit())
 		if digits:
 			nums.append(int(digits))
-	if not nums:
-		return 0
-	if op_char == '+':
-		return sum(nums)
-	if op_char == '*':
-		return reduce(operator.mul, nums, 1)
-	return 0
+	return apply_op(op_char, nums, mod)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Grand total of the worksheet problems (right-to-left column-wise numbers)')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--stream', action='store_true',
+		help='read the rows side by side in column stripes instead of loading the grid')
+	parser.add_argument('--stripe', type=int, default=1 << 16, help='stripe width in columns for --stream')
+	parser.add_argument('--mod', type=int, help='only report the grand total modulo M (checksum mode)')
+	args = parser.parse_args(argv)
+	if args.mod is not None and args.mod < 1:
+		parser.error('--mod must be at least 1')
+	if args.stripe < 1:
+		parser.error('--stripe must be at least 1')
+
+	if args.stream:
+		if not args.input_file:
+			parser.error('--stream needs an input file')
+		with open(args.input_file, 'rb') as f:
+			print(stream_groups(f, partial(parse_and_eval_group, mod=args.mod), args.stripe, args.mod))
+		return
 
-def main():
-	lines = read_lines()
+	lines = read_lines(args.input_file)
 	grid, groups = find_column_groups(lines)
-	total = 0
+	total = TreeSum(args.mod)
 	for s, e in groups:
-		total += parse_and_eval_group(grid, s, e)
-	print(total)
+		total.add(parse_and_eval_group(grid, s, e, args.mod))
+	print(total.total())
 
 if __name__ == "__main__":
-	main()
\ No newline at end of file
+	main()
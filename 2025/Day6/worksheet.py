@@ -0,0 +1,153 @@
+"""Column scanning shared by the Day6 worksheet puzzles (puzzle11/puzzle12).
+
+A column belongs to a problem group when any row has a non-space character
+in it. Instead of indexing every (row, column) cell, each row is turned into
+a bitmask with one bytes.translate call (space -> 0, anything else -> 1) and
+the rows are OR-ed together, so the work per row is a handful of C-level
+operations and no padded copies of the lines are made.
+"""
+import re
+
+# space -> '0', every other byte -> '1'
+_INK_BITS = bytes(48 if b == 32 else 49 for b in range(256))
+_RUNS = re.compile('1+')
+
+def row_mask(line):
+	# bit c set when line[c] is not a space
+	bits = line.encode('latin-1', 'replace').translate(_INK_BITS)
+	return int(bits[::-1], 2) if bits else 0
+
+def column_groups(lines):
+	# (start, end) column spans, inclusive, separated by all-space columns
+	mask = 0
+	for ln in lines:
+		mask |= row_mask(ln)
+	if not mask:
+		return []
+	cols = format(mask, 'b')[::-1]  # cols[c] == '1' when column c has ink
+	return [(m.start(), m.end() - 1) for m in _RUNS.finditer(cols)]
+
+# --- big-int arithmetic ---------------------------------------------------
+#
+# A left fold multiplies a growing product by each small operand, which is
+# quadratic in the size of the result; multiplying in a balanced tree keeps
+# the operands of every multiplication about the same size. The grand total
+# has the same issue in milder form, so it is summed pairwise as well.
+
+def tree_product(nums, mod=None):
+	# balanced product of nums (1 when empty), optionally reduced mod `mod`
+	vals = [n % mod for n in nums] if mod is not None else list(nums)
+	if not vals:
+		return 1 % mod if mod is not None else 1
+	while len(vals) > 1:
+		nxt = [a * b for a, b in zip(vals[::2], vals[1::2])]
+		if len(vals) % 2:
+			nxt.append(vals[-1])
+		vals = [v % mod for v in nxt] if mod is not None else nxt
+	return vals[0]
+
+class TreeSum:
+	# running sum that adds values pairwise like a binary counter: at most
+	# O(log n) partial sums are kept and each value is folded into the
+	# big partials only O(log n) times, instead of once per total += step
+	def __init__(self, mod=None):
+		self.mod = mod
+		self._stack = []  # (number of values, partial sum), sizes decreasing
+
+	def add(self, value):
+		stack = self._stack
+		stack.append((1, value % self.mod if self.mod is not None else value))
+		while len(stack) > 1 and stack[-1][0] == stack[-2][0]:
+			n, b = stack.pop()
+			_, a = stack.pop()
+			v = a + b
+			stack.append((2 * n, v % self.mod if self.mod is not None else v))
+
+	def total(self):
+		v = 0
+		for _, part in reversed(self._stack):
+			v += part
+		return v % self.mod if self.mod is not None else v
+
+def apply_op(op_char, nums, mod=None):
+	# value of one worksheet problem; unknown operators score 0
+	if not nums:
+		return 0
+	if op_char == '+':
+		v = sum(nums)
+		return v % mod if mod is not None else v
+	if op_char == '*':
+		return tree_product(nums, mod)
+	return 0
+
+# --- stripe streaming -----------------------------------------------------
+#
+# For worksheets a few rows tall but millions of columns wide, the rows are
+# read side by side in fixed-width column stripes (one seek per row per
+# stripe, from per-row file offsets). Groups are cut where a column is blank
+# in every row, and each group is evaluated as soon as it closes, so memory
+# is proportional to the widest group plus one stripe.
+
+def line_spans(f, block=1 << 20):
+	# (offset, length) of every line of binary file f, newline excluded
+	spans = []
+	start = 0
+	pos = 0
+	f.seek(0)
+	while True:
+		chunk = f.read(block)
+		if not chunk:
+			break
+		i = chunk.find(b'\n')
+		while i != -1:
+			spans.append((start, pos + i - start))
+			start = pos + i + 1
+			i = chunk.find(b'\n', i + 1)
+		pos += len(chunk)
+	if pos > start:
+		spans.append((start, pos - start))
+	return spans
+
+def stream_groups(f, evaluate, stripe=1 << 16, mod=None):
+	# f: binary file; evaluate(rows, start, end) scores one group the way
+	# parse_and_eval_group does. Returns the sum over all groups (mod `mod`).
+	spans = line_spans(f)
+	width = max((ln for _, ln in spans), default=0)
+	pending = [bytearray() for _ in spans]
+	group_width = 0
+	total = TreeSum(mod)
+
+	def close():
+		nonlocal group_width
+		rows = [bytes(p).decode('latin-1') for p in pending]
+		total.add(evaluate(rows, 0, group_width - 1))
+		for p in pending:
+			p.clear()
+		group_width = 0
+
+	for col0 in range(0, width, stripe):
+		cols_here = min(stripe, width - col0)
+		segs = []
+		for off, ln in spans:
+			if col0 >= ln:
+				segs.append(b'')
+				continue
+			f.seek(off + col0)
+			segs.append(f.read(min(cols_here, ln - col0)))
+		mask = 0
+		for seg in segs:
+			if seg:
+				mask |= int(seg.translate(_INK_BITS)[::-1], 2)
+		cols = format(mask, 'b')[::-1] if mask else ''
+		for m in _RUNS.finditer(cols):
+			a, b = m.start(), m.end()
+			if group_width and a > 0:
+				close()  # blank columns since the previous run
+			for p, seg in zip(pending, segs):
+				p += seg[a:b]
+			group_width += b - a
+		if group_width and len(cols) < cols_here:
+			close()  # stripe ends in blank columns
+	if group_width:
+		close()
+	return total.total()
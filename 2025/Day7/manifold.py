@@ -0,0 +1,319 @@
+"""Row-level engines for the Day7 tachyon manifold, shared by puzzle13 and
+puzzle14. Grids are the padded row strings the puzzles build in main().
+"""
+try:
+	import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+	np = None
+
+# '^' -> '1', every other byte -> '0'
+_SPLIT_BITS = bytes(49 if b == ord('^') else 48 for b in range(256))
+
+def splitter_mask(row):
+	# bit c set when row[c] is a splitter
+	bits = row.encode('latin-1', 'replace').translate(_SPLIT_BITS)
+	return int(bits[::-1], 2) if bits else 0
+
+def simulate_bits(grid, start):
+	# Same as puzzle13.simulate, with the beam front held as one int (bit c =
+	# a beam in column c) once it is wide. Per row: hits = beams & splitters,
+	# every hit counts one split and moves to c-1 and c+1 (clipped to the
+	# grid width). While the front is narrow it stays a set of columns read
+	# straight from the row; once wide, rows without splitters are skipped,
+	# so row masks are only built when they pay for themselves.
+	h = len(grid)
+	sr, sc = start
+	if h == 0 or sr is None or sr + 1 >= h:
+		return 0
+	w = len(grid[0])
+	if not 0 <= sc < w:
+		return 0
+	full = (1 << w) - 1
+	narrow = max(w >> 6, 8)
+	front = {sc}
+	beams = 0
+	split_count = 0
+	for r in range(sr + 1, h):
+		row = grid[r]
+		if front is not None:
+			nxt = set()
+			for c in front:
+				if row[c] == '^':
+					split_count += 1
+					if c > 0:
+						nxt.add(c - 1)
+					if c + 1 < w:
+						nxt.add(c + 1)
+				else:
+					nxt.add(c)
+			if not nxt:
+				break
+			front = nxt
+			if len(front) > narrow:
+				# wide enough: switch to the bitset for the remaining rows
+				for c in front:
+					beams |= 1 << c
+				front = None
+			continue
+		if '^' not in row:
+			continue
+		hits = beams & splitter_mask(row)
+		if hits:
+			split_count += hits.bit_count()
+			beams = ((beams ^ hits) | (hits << 1) | (hits >> 1)) & full
+			if not beams:
+				break
+	return split_count
+
+def splitter_runs(grid, first_row=0):
+	# Every inclusive run (a, b) of adjacent '^' in rows >= first_row, as
+	# flat lists (bounds, starts, ends): starts/ends in row-major order, and
+	# the runs of grid row first_row + i are starts[bounds[i]:bounds[i + 1]].
+	# Rows without splitters hold no runs, so sweeping them costs nothing.
+	grid = grid[first_row:]
+	w = len(grid[0]) if grid else 0
+	if np is not None and w and all(len(row) == w for row in grid):
+		cells = np.frombuffer(''.join(grid).encode('latin-1', 'replace'), dtype=np.uint8)
+		split = (cells == ord('^')).reshape(len(grid), w)
+		first = split.copy()
+		first[:, 1:] &= ~split[:, :-1]
+		last = split.copy()
+		last[:, :-1] &= ~split[:, 1:]
+		starts = np.flatnonzero(first)
+		ends = np.flatnonzero(last)
+		bounds = np.searchsorted(starts, np.arange(len(grid) + 1) * w)
+		return bounds.tolist(), (starts % w).tolist(), (ends % w).tolist()
+	bounds, starts, ends = [0], [], []
+	for row in grid:
+		if '^' in row:
+			# every piece after the first follows a '^' at column c; an empty
+			# piece means the next '^' is adjacent, i.e. the run goes on
+			pieces = row.split('^')
+			c = a = len(pieces[0])
+			for piece in pieces[1:]:
+				if piece:
+					starts.append(a)
+					ends.append(c)
+					c += len(piece) + 1
+					a = c
+				else:
+					c += 1
+			if not pieces[-1]:
+				starts.append(a)
+				ends.append(c - 1)
+		bounds.append(len(starts))
+	return bounds, starts, ends
+
+def quantum_timelines_runs(grid, start, runs=None):
+	# Same outputs as puzzle14.quantum_timelines (multiplicity, distinct exits)
+	# without per-row copies or queues: the counts live in one list and each
+	# splitter run moves the histories that land on it to the cells just
+	# outside it, a-1 and b+1. Those cells are never splitters, so the runs of
+	# a row can be applied in place in any order, and the runs of all rows
+	# can be swept as one flat row-major sequence. A run of several adjacent
+	# splitters acts as one wide splitter (the queue cascade never settles
+	# on such a run).
+	h = len(grid)
+	sr, sc = start
+	if h == 0 or sr is None or sc is None or sr + 1 >= h:
+		return 0, 0
+	w = len(grid[0])
+	if runs is None:
+		runs = splitter_runs(grid, sr + 1)
+	_, starts, ends = runs
+	curr = [0] * w
+	curr[sc] = 1
+	for a, b in zip(starts, ends):
+		if a == b:
+			cnt = curr[a]
+			if not cnt:
+				continue
+			curr[a] = 0
+		else:
+			cnt = sum(curr[a:b + 1])
+			if not cnt:
+				continue
+			curr[a:b + 1] = [0] * (b - a + 1)
+		if a > 0:
+			curr[a - 1] += cnt
+		if b + 1 < w:
+			curr[b + 1] += cnt
+	return sum(curr), sum(1 for v in curr if v > 0)
+
+class ManifoldTable:
+	# Bottom-up DP over the whole grid answering, for a source at any (row,
+	# col), what puzzle13 and puzzle14 would report with 'S' placed there:
+	#   mult[r][c]   timelines reaching the bottom from a beam entering row r
+	#                at column c (quantum cascade, runs as wide splitters)
+	#   exits[r][c]  bitmask of the columns those timelines leave from
+	#   splits[r][c] bitmask of the splitters the merged beam hits (puzzle13)
+	# Rows without splitters share the lists of the row below, so only rows
+	# with splitters cost O(width) to build.
+	def __init__(self, grid):
+		h = len(grid)
+		w = len(grid[0]) if h else 0
+		self.h = h
+		self.w = w
+		mult = [1] * w
+		exits = [1 << c for c in range(w)]
+		splits = [0] * w
+		# index h is the bottom edge
+		self.mult = [None] * (h + 1)
+		self.exits = [None] * (h + 1)
+		self.splits = [None] * (h + 1)
+		self.mult[h], self.exits[h], self.splits[h] = mult, exits, splits
+		bounds, run_starts, run_ends = splitter_runs(grid)
+		bit = 0
+		for r in range(h - 1, -1, -1):
+			i, j = bounds[r], bounds[r + 1]
+			if i < j:
+				below_m, below_e, below_s = mult, exits, splits
+				mult, exits, splits = below_m[:], below_e[:], below_s[:]
+				for a, b in zip(run_starts[i:j], run_ends[i:j]):
+					m = 0
+					e = 0
+					if a > 0:
+						m += below_m[a - 1]
+						e |= below_e[a - 1]
+					if b + 1 < w:
+						m += below_m[b + 1]
+						e |= below_e[b + 1]
+					for c in range(a, b + 1):
+						mult[c] = m
+						exits[c] = e
+						s = 1 << bit
+						bit += 1
+						if c > 0:
+							s |= below_s[c - 1]
+						if c + 1 < w:
+							s |= below_s[c + 1]
+						splits[c] = s
+			self.mult[r], self.exits[r], self.splits[r] = mult, exits, splits
+
+	def timelines_from(self, row, col):
+		# (multiplicity, distinct exits, split count) for a source at (row, col)
+		if not (0 <= row and row + 1 < self.h and 0 <= col < self.w):
+			return 0, 0, 0
+		r = row + 1
+		return self.mult[r][col], self.exits[r][col].bit_count(), self.splits[r][col].bit_count()
+
+# --- periodic manifolds -----------------------------------------------------
+#
+# When the rows below the source are one block of rows repeated many times,
+# the per-row walk can be replaced by work logarithmic in the repeat count:
+#   * timeline counts are linear in the counts entering the block, so one
+#     period is a sparse column-to-column transfer operator, raised to the
+#     repeat count by squaring;
+#   * the merged beam front of puzzle13 is a deterministic function of the
+#     front entering the block, so fronts are cached per block and the walk
+#     jumps over whole cycles once a front repeats.
+
+def find_period(rows):
+	# smallest p with len(rows) % p == 0 and rows == rows[:p] * (len(rows) // p)
+	n = len(rows)
+	for p in range(1, n + 1):
+		if n % p == 0 and all(rows[i] == rows[i % p] for i in range(p, n)):
+			return p
+	return n
+
+def _block(grid, start, period, repeats):
+	# (block rows, total repetitions) for the rows below the source
+	if repeats < 0:
+		raise ValueError(f'repeats must not be negative, got {repeats}')
+	rows = grid[start[0] + 1:]
+	if period is None:
+		period = find_period(rows)
+	if period <= 0 or len(rows) % period or any(rows[i] != rows[i % period] for i in range(len(rows))):
+		raise ValueError(f'rows below the source do not repeat with period {period}')
+	return rows[:period], len(rows) // period * repeats
+
+def block_operator(rows, w):
+	# sparse transfer operator of one block: op[src] = {dst: histories}
+	# for one history entering the block at column src
+	op = {}
+	_, starts, ends = splitter_runs(rows)
+	for src in range(w):
+		curr = {src: 1}
+		for a, b in zip(starts, ends):
+			cnt = 0
+			for c in range(a, b + 1):
+				cnt += curr.pop(c, 0)
+			if not cnt:
+				continue
+			if a > 0:
+				curr[a - 1] = curr.get(a - 1, 0) + cnt
+			if b + 1 < w:
+				curr[b + 1] = curr.get(b + 1, 0) + cnt
+		op[src] = curr
+	return op
+
+def apply_operator(op, vec):
+	out = {}
+	for src, cnt in vec.items():
+		for dst, k in op[src].items():
+			out[dst] = out.get(dst, 0) + cnt * k
+	return out
+
+def compose(first, then):
+	# operator for applying `first`, then `then`
+	return {src: apply_operator(then, vec) for src, vec in first.items()}
+
+def quantum_timelines_periodic(grid, start, repeats=1, period=None):
+	# puzzle14 outputs when the rows below the source are `period` rows
+	# repeated (len // period) * repeats times
+	sr, sc = start
+	if not grid or sr is None or sc is None or sr + 1 >= len(grid):
+		return 0, 0
+	w = len(grid[0])
+	block, reps = _block(grid, start, period, repeats)
+	op = block_operator(block, w)
+	vec = {sc: 1}
+	while reps:
+		if reps & 1:
+			vec = apply_operator(op, vec)
+		reps >>= 1
+		if reps:
+			op = compose(op, op)
+	return sum(vec.values()), sum(1 for v in vec.values() if v > 0)
+
+def simulate_periodic(grid, start, repeats=1, period=None):
+	# puzzle13 split count for the same periodic layout
+	sr, sc = start
+	if not grid or sr is None or sr + 1 >= len(grid):
+		return 0
+	w = len(grid[0])
+	if not 0 <= sc < w:
+		return 0
+	block, reps = _block(grid, start, period, repeats)
+	masks = [splitter_mask(row) for row in block]
+	full = (1 << w) - 1
+
+	def step(beams):
+		splits = 0
+		for split in masks:
+			hits = beams & split
+			if hits:
+				splits += hits.bit_count()
+				beams = ((beams ^ hits) | (hits << 1) | (hits >> 1)) & full
+		return beams, splits
+
+	beams = 1 << sc
+	total = 0
+	seen = {}
+	k = 0
+	while k < reps and beams:
+		if beams in seen:
+			k0, total0 = seen[beams]
+			cycle = k - k0
+			gained = total - total0
+			skip = (reps - k) // cycle
+			total += skip * gained
+			k += skip * cycle
+			seen.clear()
+			if k >= reps:
+				break
+		seen[beams] = (k, total)
+		beams, splits = step(beams)
+		total += splits
+		k += 1
+	return total
@@ -1,8 +1,10 @@
 import sys
+import argparse
 
-def read_lines():
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
+from manifold import simulate_bits, simulate_periodic
+
+def read_lines(path=None):
+	if path:
 		with open(path, 'r') as f:
 			lines = [ln.rstrip('\n') for ln in f]
 	else:
@@ -50,15 +52,36 @@ def simulate(grid):
 		beams = next_beams
 	return split_count
 
-def main():
-	lines = read_lines()
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Count beam splits in the manifold')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	parser.add_argument('--engine', choices=('bits', 'set'), default='bits',
+		help='int bitset beam front or per-beam set (default: bits)')
+	parser.add_argument('--repeats', type=int,
+		help='the rows below S repeat this many times (cycle-skipping engine)')
+	parser.add_argument('--period', type=int,
+		help='row period of the rows below S for --repeats (default: detected)')
+	args = parser.parse_args(argv)
+	if args.repeats is not None and args.repeats < 0:
+		parser.error('--repeats must not be negative')
+
+	lines = read_lines(args.input_file)
 	if not lines:
 		print(0)
 		return
 	width = max(len(ln) for ln in lines)
 	# pad lines to uniform width with spaces
 	grid = [ln.ljust(width) for ln in lines]
-	print(simulate(grid))
+	if args.repeats is not None or args.period is not None:
+		repeats = 1 if args.repeats is None else args.repeats
+		try:
+			print(simulate_periodic(grid, find_start(grid), repeats, args.period))
+		except ValueError as e:
+			parser.error(str(e))
+	elif args.engine == 'set':
+		print(simulate(grid))
+	else:
+		print(simulate_bits(grid, find_start(grid)))
 
 if __name__ == "__main__":
-	main()
\ No newline at end of file
+	main()
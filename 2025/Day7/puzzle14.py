@@ -1,9 +1,11 @@
 import sys
+import argparse
 from collections import deque
 
-def read_lines():
-	if len(sys.argv) > 1:
-		path = sys.argv[1]
+from manifold import quantum_timelines_runs, quantum_timelines_periodic, ManifoldTable
+
+def read_lines(path=None):
+	if path:
 		with open(path, 'r') as f:
 			lines = [ln.rstrip('\n') for ln in f]
 	else:
@@ -65,21 +67,64 @@ def quantum_timelines(grid):
 	distinct_exits = sum(1 for v in curr if v > 0)  # number of distinct exit columns
 	return total_multiplicity, distinct_exits
 
-def main():
-	lines = read_lines()
+def read_starts(path):
+	# one "row,col" (or "row col") start position per line
+	starts = []
+	with open(path, 'r') as f:
+		for ln in f:
+			parts = ln.replace(',', ' ').split()
+			if len(parts) != 2:
+				continue
+			try:
+				starts.append((int(parts[0]), int(parts[1])))
+			except ValueError:
+				continue
+	return starts
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Count quantum timelines through the manifold')
+	parser.add_argument('input_file', nargs='?', help='path to input file (default: stdin)')
+	# simple CLI mode: --mode=multiplicity (default), --mode=distinct, --mode=both
+	parser.add_argument('--mode', type=str.lower, default='multiplicity',
+		help='multiplicity (default), distinct or both')
+	parser.add_argument('--engine', choices=('runs', 'queue'), default='runs',
+		help='splitter-run sweep or per-row queue cascade (default: runs)')
+	parser.add_argument('--starts',
+		help='file of "row,col" source positions; prints "row,col multiplicity distinct splits" for each')
+	parser.add_argument('--repeats', type=int,
+		help='the rows below S repeat this many times (transfer-operator engine)')
+	parser.add_argument('--period', type=int,
+		help='row period of the rows below S for --repeats (default: detected)')
+	args = parser.parse_args(argv)
+	if args.repeats is not None and args.repeats < 0:
+		parser.error('--repeats must not be negative')
+
+	lines = read_lines(args.input_file)
 	if not lines:
 		print(0)
 		return
 	width = max(len(ln) for ln in lines)
 	grid = [ln.ljust(width) for ln in lines]
+	mode = args.mode.strip()
 
-	# simple CLI mode: --mode=multiplicity (default), --mode=distinct, --mode=both
-	mode = 'multiplicity'
-	for a in sys.argv[1:]:
-		if a.startswith('--mode='):
-			mode = a.split('=', 1)[1].strip().lower()
+	if args.starts:
+		# one bottom-up pass answers every source; the 'S' in the grid is ignored
+		table = ManifoldTable(grid)
+		for r, c in read_starts(args.starts):
+			total, distinct, splits = table.timelines_from(r, c)
+			print(f"{r},{c} {total} {distinct} {splits}")
+		return
 
-	total, distinct = quantum_timelines(grid)
+	if args.repeats is not None or args.period is not None:
+		repeats = 1 if args.repeats is None else args.repeats
+		try:
+			total, distinct = quantum_timelines_periodic(grid, find_start(grid), repeats, args.period)
+		except ValueError as e:
+			parser.error(str(e))
+	elif args.engine == 'queue':
+		total, distinct = quantum_timelines(grid)
+	else:
+		total, distinct = quantum_timelines_runs(grid, find_start(grid))
 	if mode == 'distinct':
 		print(distinct)
 	elif mode == 'both':
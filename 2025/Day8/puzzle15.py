@@ -1,4 +1,7 @@
 import sys
+import heapq
+import argparse
+from math import pi
 
 def read_points(path=None):
 	if path:
@@ -52,15 +55,9 @@ def product_top3(nums):
 	# if fewer than 3 components, treat missing ones as 1 (no change)
 	return prod
 
-def main():
-	# input path optional; default to Day8 input file
-	path = sys.argv[1] if len(sys.argv) > 1 else '/home/vikasv/projects/AOC/2025/Day8/input.txt'
-	points = read_points(path)
+def all_pairs(points):
+	# every (dsq, i, j) with i < j, squared distances to avoid floats
 	n = len(points)
-	if n == 0:
-		print(1)
-		return
-	# build all pair distances (squared to avoid float)
 	pairs = []
 	for i in range(n):
 		x1, y1, z1 = points[i]
@@ -71,16 +68,88 @@ def main():
 			dz = z1 - z2
 			dsq = dx*dx + dy*dy + dz*dz
 			pairs.append((dsq, i, j))
-	if not pairs:
-		# only one point
+	return pairs
+
+def closest_pairs(points, k):
+	# The k smallest (dsq, i, j) in the same order as sorting all_pairs, found
+	# with a uniform 3-D grid: for a radius r, bucket the points into cells of
+	# side r and scan only neighbouring cells for pairs with dsq <= r*r. If at
+	# least k pairs are that close, the k smallest overall are among them
+	# (every pair left out is farther, ties included); otherwise r doubles.
+	# A bounded heap keeps only the k best candidates.
+	n = len(points)
+	k = min(k, n * (n - 1) // 2)
+	if k <= 0:
+		return []
+	xs, ys, zs = zip(*points)
+	extent = [max(v) - min(v) for v in (xs, ys, zs)]
+	volume = 1
+	for e in extent:
+		volume *= max(e, 1)
+	# radius holding about k pairs if the points were spread uniformly
+	r = max(1, int((3 * k * volume / (2 * pi * n * n)) ** (1 / 3)) + 1)
+	diameter_sq = sum(e * e for e in extent)
+	while True:
+		rsq = r * r
+		cells = {}
+		for idx, (x, y, z) in enumerate(points):
+			cells.setdefault((x // r, y // r, z // r), []).append(idx)
+		heap = []  # (-dsq, -i, -j): the worst kept pair sits on top
+		found = 0
+		for (cx, cy, cz), members in cells.items():
+			near = []
+			for dx in (-1, 0, 1):
+				for dy in (-1, 0, 1):
+					for dz in (-1, 0, 1):
+						near.extend(cells.get((cx + dx, cy + dy, cz + dz), ()))
+			for i in members:
+				x1, y1, z1 = points[i]
+				for j in near:
+					if j <= i:
+						continue
+					x2, y2, z2 = points[j]
+					dx = x1 - x2
+					dy = y1 - y2
+					dz = z1 - z2
+					dsq = dx*dx + dy*dy + dz*dz
+					if dsq > rsq:
+						continue
+					found += 1
+					item = (-dsq, -i, -j)
+					if len(heap) < k:
+						heapq.heappush(heap, item)
+					elif item > heap[0]:
+						heapq.heapreplace(heap, item)
+		if found >= k or rsq >= diameter_sq:
+			return sorted((-d, -i, -j) for d, i, j in heap)
+		r *= 2
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Join the closest junction boxes and multiply the 3 largest circuits')
+	# input path optional; default to Day8 input file
+	parser.add_argument('input_file', nargs='?', default='/home/vikasv/projects/AOC/2025/Day8/input.txt',
+		help='path to input file')
+	parser.add_argument('--k', type=int, default=1000, help='number of closest pairs to connect (default: 1000)')
+	parser.add_argument('--engine', choices=('grid', 'all-pairs'), default='grid',
+		help='grid-bucketed k closest pairs or sort every pair (default: grid)')
+	args = parser.parse_args(argv)
+
+	points = read_points(args.input_file)
+	n = len(points)
+	if n < 2:
+		# no points or only one point: no pairs to connect
 		print(1)
 		return
-	pairs.sort(key=lambda t: (t[0], t[1], t[2]))
-	K = min(1000, len(pairs))
+	if args.engine == 'all-pairs':
+		# build all pair distances (squared to avoid float)
+		pairs = all_pairs(points)
+		pairs.sort(key=lambda t: (t[0], t[1], t[2]))
+		pairs = pairs[:min(args.k, len(pairs))]
+	else:
+		pairs = closest_pairs(points, args.k)
 	dsu = DSU(n)
 	# connect the K closest pairs (even if union doesn't change components)
-	for k in range(K):
-		_, a, b = pairs[k]
+	for _, a, b in pairs:
 		dsu.union(a, b)
 	sizes = dsu.component_sizes()
 	print(product_top3(sizes))